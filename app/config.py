@@ -1,16 +1,31 @@
 """Application configuration settings."""
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
-    
+
     app_name: str = "Indian Bank Branches API"
     app_version: str = "1.0.0"
     database_url: str = "sqlite:///./bank_branches.db"
     debug: bool = False
-    
+    # Origins allowed by CORS; set to concrete origins in production so
+    # credentialed requests work (browsers reject "*" with credentials)
+    allowed_origins: List[str] = ["*"]
+    # Seconds to serve /api/stats counts from memory before re-counting;
+    # 0 disables the cache (counting the branches PK index is the most
+    # expensive repeated query in the app)
+    stats_cache_ttl: int = 60
+    # Maximum entries in the in-process response cache for the list
+    # endpoints (keyed per URL + query params). Off by default: entries
+    # have no TTL, and data loads (scripts/load_data.py) can run against
+    # the same database out of band, which would leave cached responses
+    # stale forever. Enable only where the data is immutable for the
+    # process lifetime (e.g. the test suite, or behind an explicit
+    # clear_response_caches() after each load).
+    response_cache_size: int = 0
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,5 +1,5 @@
 """CRUD operations for database models."""
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
 from sqlalchemy import func, or_
 from typing import List, Optional
 from app import models, schemas
@@ -19,6 +19,20 @@ def get_bank(db: Session, bank_id: int) -> Optional[models.Bank]:
     return db.query(models.Bank).filter(models.Bank.id == bank_id).first()
 
 
+def bank_exists(db: Session, bank_id: int) -> bool:
+    """
+    Check whether a bank exists without loading the full row.
+
+    Args:
+        db: Database session
+        bank_id: ID of the bank to check
+
+    Returns:
+        True if a bank with the given ID exists, False otherwise
+    """
+    return db.query(models.Bank.id).filter_by(id=bank_id).first() is not None
+
+
 def get_bank_by_name(db: Session, bank_name: str) -> Optional[models.Bank]:
     """
     Retrieve a bank by its name (case-insensitive).
@@ -36,20 +50,20 @@ def get_bank_by_name(db: Session, bank_name: str) -> Optional[models.Bank]:
 
 
 def get_banks(
-    db: Session, 
-    skip: int = 0, 
-    limit: int = 100,
+    db: Session,
+    skip: int = 0,
+    limit: Optional[int] = 100,
     search: Optional[str] = None
 ) -> List[models.Bank]:
     """
     Retrieve list of banks with optional search and pagination.
-    
+
     Args:
         db: Database session
         skip: Number of records to skip (for pagination)
-        limit: Maximum number of records to return
+        limit: Maximum number of records to return (None = no limit)
         search: Optional search term to filter banks by name
-        
+
     Returns:
         List of Bank model instances
     """
@@ -80,6 +94,38 @@ def get_banks_count(db: Session, search: Optional[str] = None) -> int:
     return query.scalar()
 
 
+def _location_filter(db: Session, lookup_model, id_column, string_column, name: str):
+    """
+    Build a branch filter for one location column.
+
+    Combines two conditions with OR: the branch's integer reference
+    column matching any lookup-table id whose name matches
+    case-insensitively (the lookup may hold several case variants of the
+    same name), and the case-insensitive comparison on the denormalized
+    string column, which covers rows whose id column was never populated
+    (e.g. databases loaded before the lookup tables existed). The id
+    comparison lets the planner use the far smaller integer index where
+    the ids are populated.
+
+    Args:
+        db: Database session
+        lookup_model: Lookup table model (City, District or State)
+        id_column: Branch column referencing the lookup table
+        string_column: Branch string column holding the denormalized name
+        name: Location name to filter by
+
+    Returns:
+        SQLAlchemy filter expression
+    """
+    lookup_ids = db.query(lookup_model.id).filter(
+        func.lower(lookup_model.name) == name.lower()
+    ).scalar_subquery()
+    return or_(
+        id_column.in_(lookup_ids),
+        func.lower(string_column) == name.lower()
+    )
+
+
 def get_branch(db: Session, ifsc: str) -> Optional[models.Branch]:
     """
     Retrieve a branch by its IFSC code.
@@ -105,11 +151,12 @@ def get_branches(
     city: Optional[str] = None,
     district: Optional[str] = None,
     state: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    after_ifsc: Optional[str] = None
 ) -> List[models.Branch]:
     """
     Retrieve list of branches with optional filters and pagination.
-    
+
     Args:
         db: Database session
         skip: Number of records to skip (for pagination)
@@ -120,11 +167,24 @@ def get_branches(
         district: Optional filter by district (case-insensitive)
         state: Optional filter by state (case-insensitive)
         search: Optional search term to filter branches by name or address
-        
+        after_ifsc: Optional keyset cursor; return branches with IFSC
+            greater than this value, ordered by IFSC (replaces skip)
+
     Returns:
         List of Branch model instances with bank details
     """
-    query = db.query(models.Branch).options(joinedload(models.Branch.bank))
+    # selectinload fetches the handful of referenced banks in one extra
+    # query instead of widening every branch row with joined bank columns;
+    # load_only keeps the lookup-table id columns out of the SELECT since
+    # responses only need the string fields
+    query = db.query(models.Branch).options(
+        load_only(
+            models.Branch.ifsc, models.Branch.bank_id, models.Branch.branch,
+            models.Branch.address, models.Branch.city, models.Branch.district,
+            models.Branch.state
+        ),
+        selectinload(models.Branch.bank)
+    )
     
     if bank_id:
         query = query.filter(models.Branch.bank_id == bank_id)
@@ -135,13 +195,19 @@ def get_branches(
         )
     
     if city:
-        query = query.filter(func.lower(models.Branch.city) == city.lower())
+        query = query.filter(_location_filter(
+            db, models.City, models.Branch.city_id, models.Branch.city, city
+        ))
     
     if district:
-        query = query.filter(func.lower(models.Branch.district) == district.lower())
+        query = query.filter(_location_filter(
+            db, models.District, models.Branch.district_id, models.Branch.district, district
+        ))
     
     if state:
-        query = query.filter(func.lower(models.Branch.state) == state.lower())
+        query = query.filter(_location_filter(
+            db, models.State, models.Branch.state_id, models.Branch.state, state
+        ))
     
     if search:
         search_term = f"%{search}%"
@@ -152,10 +218,91 @@ def get_branches(
                 models.Branch.ifsc.ilike(search_term)
             )
         )
-    
+
+    # Keyset pagination: seek straight to the cursor position via the
+    # primary-key index instead of counting and discarding OFFSET rows,
+    # so deep pages cost the same as the first one. An empty cursor means
+    # "from the beginning" and just pins the IFSC ordering.
+    if after_ifsc is not None:
+        return (
+            query.filter(models.Branch.ifsc > after_ifsc.upper())
+            .order_by(models.Branch.ifsc)
+            .limit(limit)
+            .all()
+        )
+
     return query.offset(skip).limit(limit).all()
 
 
+def iter_branches(
+    db: Session,
+    bank_id: Optional[int] = None,
+    bank_name: Optional[str] = None,
+    city: Optional[str] = None,
+    district: Optional[str] = None,
+    state: Optional[str] = None,
+    search: Optional[str] = None
+):
+    """
+    Iterate over all branches matching the filters without pagination.
+
+    Streams rows from a single server-side cursor in batches of 1000 via
+    yield_per, so exports hold O(batch) rows in memory and avoid the
+    repeated OFFSET scans of paginated fetching.
+
+    Args:
+        db: Database session
+        bank_id: Optional filter by bank ID
+        bank_name: Optional filter by bank name (case-insensitive)
+        city: Optional filter by city (case-insensitive)
+        district: Optional filter by district (case-insensitive)
+        state: Optional filter by state (case-insensitive)
+        search: Optional search term to filter branches
+
+    Returns:
+        Iterator of Branch model instances with bank details
+    """
+    query = db.query(models.Branch).options(joinedload(models.Branch.bank))
+
+    if bank_id:
+        query = query.filter(models.Branch.bank_id == bank_id)
+
+    if bank_name:
+        query = query.join(models.Bank).filter(
+            func.lower(models.Bank.name) == bank_name.lower()
+        )
+
+    if city:
+        query = query.filter(_location_filter(
+            db, models.City, models.Branch.city_id, models.Branch.city, city
+        ))
+
+    if district:
+        query = query.filter(_location_filter(
+            db, models.District, models.Branch.district_id, models.Branch.district, district
+        ))
+
+    if state:
+        query = query.filter(_location_filter(
+            db, models.State, models.Branch.state_id, models.Branch.state, state
+        ))
+
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            or_(
+                models.Branch.branch.ilike(search_term),
+                models.Branch.address.ilike(search_term),
+                models.Branch.ifsc.ilike(search_term)
+            )
+        )
+
+    # joinedload (not selectinload) here: selectinload issues its batched
+    # IN-query eagerly per yield_per window, while the join streams both
+    # tables through the one cursor
+    return query.yield_per(1000)
+
+
 def get_branches_count(
     db: Session,
     bank_id: Optional[int] = None,
@@ -191,13 +338,19 @@ def get_branches_count(
         )
     
     if city:
-        query = query.filter(func.lower(models.Branch.city) == city.lower())
+        query = query.filter(_location_filter(
+            db, models.City, models.Branch.city_id, models.Branch.city, city
+        ))
     
     if district:
-        query = query.filter(func.lower(models.Branch.district) == district.lower())
+        query = query.filter(_location_filter(
+            db, models.District, models.Branch.district_id, models.Branch.district, district
+        ))
     
     if state:
-        query = query.filter(func.lower(models.Branch.state) == state.lower())
+        query = query.filter(_location_filter(
+            db, models.State, models.Branch.state_id, models.Branch.state, state
+        ))
     
     if search:
         search_term = f"%{search}%"
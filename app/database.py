@@ -3,10 +3,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import settings
 
-# Create database engine
+# Create database engine. insertmanyvalues_page_size tunes how many rows
+# SQLAlchemy packs into each multi-row INSERT during bulk loads.
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
+    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+    insertmanyvalues_page_size=1000
 )
 
 # Create session factory
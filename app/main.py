@@ -1,8 +1,14 @@
 """Main FastAPI application with REST API and GraphQL endpoints."""
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+import hashlib
 import os
+import re
+import time
+from collections import OrderedDict
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.responses import StreamingResponse
 import csv
 from io import StringIO
@@ -13,20 +19,27 @@ from app import crud, models, schemas
 from app.database import engine, get_db, SessionLocal
 from app.config import settings
 
-# Try to import GraphQL (optional - REST API works without it)
-try:
-    import importlib
-    strawberry_fastapi = importlib.import_module("strawberry.fastapi")
-    GraphQLRouter = getattr(strawberry_fastapi, "GraphQLRouter")
-    from app.graphql_schema import schema
-    GRAPHQL_AVAILABLE = True
-except Exception:
-    GRAPHQL_AVAILABLE = False
-    print("Warning: GraphQL not available. REST API will work without GraphQL.")
-    print("To enable GraphQL, install Rust and run: pip install 'strawberry-graphql[fastapi]'")
-
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# GraphQL support (optional - REST API works without it). Set
+# ENABLE_GRAPHQL=0 to skip the strawberry import entirely and shave its
+# cost off every cold start.
+GRAPHQL_AVAILABLE = False
+if os.environ.get("ENABLE_GRAPHQL", "1") == "1":
+    try:
+        from strawberry.fastapi import GraphQLRouter
+        from app.graphql_schema import schema
+        GRAPHQL_AVAILABLE = True
+    except Exception:
+        print("Warning: GraphQL not available. REST API will work without GraphQL.")
+        print("To enable GraphQL, install Rust and run: pip install 'strawberry-graphql[fastapi]'")
+
+# Create database tables. Set DB_AUTO_CREATE=0 when the schema is managed
+# externally (e.g. migrations) to skip the synchronous schema reflection
+# on every startup.
+if os.environ.get("DB_AUTO_CREATE", "1") == "1":
+    models.Base.metadata.create_all(bind=engine)
+    # create_all only creates missing tables; this adds columns that
+    # newer releases introduced on existing tables
+    models.upgrade_schema(engine)
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -42,15 +55,65 @@ if GRAPHQL_AVAILABLE:
     graphql_app = GraphQLRouter(schema)
     app.include_router(graphql_app, prefix="/graphql")
 
-# Configure CORS
+# Compress large JSON payloads (branch list pages are a few hundred KB of
+# highly repetitive keys; gzip cuts them by ~85%). Small responses like
+# /health skip compression via minimum_size.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+class PreflightShortCircuitMiddleware:
+    """
+    Answer CORS preflight requests at the ASGI layer.
+
+    OPTIONS requests for API paths are served from a precomputed 204
+    response before Starlette's routing (or any other middleware) runs, so
+    a preflight costs a single socket write instead of a full dispatch.
+    Only active when CORS is configured with a wildcard origin, where the
+    response headers are the same for every caller.
+    """
+
+    _PATH_PREFIXES = ("/api/", "/health", "/graphql")
+
+    _HEADERS = [
+        (b"access-control-allow-origin", b"*"),
+        (b"access-control-allow-methods", b"GET, POST"),
+        (b"access-control-allow-headers", b"*"),
+        (b"access-control-max-age", b"86400"),
+    ]
+
+    def __init__(self, app):
+        self.app = app
+        self.enabled = settings.allowed_origins == ["*"]
+
+    async def __call__(self, scope, receive, send):
+        if (
+            self.enabled
+            and scope["type"] == "http"
+            and scope["method"] == "OPTIONS"
+            and scope["path"].startswith(self._PATH_PREFIXES)
+        ):
+            await send({"type": "http.response.start", "status": 204, "headers": self._HEADERS})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await self.app(scope, receive, send)
+
+
+# Configure CORS. Credentials are only allowed with a concrete origin list,
+# and max_age lets browsers cache the preflight response for a day instead
+# of re-issuing an OPTIONS request before every call.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=settings.allowed_origins,
+    allow_credentials=settings.allowed_origins != ["*"],
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
+# Added after CORSMiddleware so it runs first and can short-circuit
+# preflights before any other per-request work happens
+app.add_middleware(PreflightShortCircuitMiddleware)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -96,61 +159,148 @@ async def startup_event():
         print("GraphQL not enabled. Install 'strawberry-graphql[fastapi]' to enable GraphQL playground.")
 
 
+# Responses for the root and health endpoints never change after startup,
+# so build them once instead of re-reading settings and re-allocating the
+# dicts on every request (these endpoints are hit by liveness probes)
+_ROOT_RESPONSE = {
+    "message": f"Welcome to {settings.app_name}",
+    "version": settings.app_version,
+    "docs": "/docs",
+    "ui": "/ui",
+    "graphql": "/graphql" if GRAPHQL_AVAILABLE else "Not available (install Rust and strawberry-graphql)",
+    "endpoints": {
+        "banks": "/api/banks",
+        "branches": "/api/branches",
+        "health": "/health",
+        "ui": "/ui"
+    }
+}
+
+_HEALTH_RESPONSE = {"status": "healthy", "version": settings.app_version}
+
+
+def _branch_rows(branches, with_bank: bool = True):
+    """
+    Serialize Branch rows to plain dicts for the list endpoints.
+
+    Returning an ORJSONResponse built from these dicts skips Pydantic's
+    per-row model re-validation on the response path, which dominates CPU
+    time for large pages; the decorator response_model still documents the
+    schema in OpenAPI.
+    """
+    return [
+        {
+            "ifsc": b.ifsc,
+            "branch": b.branch,
+            "address": b.address,
+            "city": b.city,
+            "district": b.district,
+            "state": b.state,
+            "bank_id": b.bank_id,
+            **({"bank": {"name": b.bank.name, "id": b.bank.id}} if with_bank else {}),
+        }
+        for b in branches
+    ]
+
+
+# Response cache for the idempotent list endpoints: the same filter/page
+# permutations are requested over and over (UI searches, pagination
+# clicks), and every miss costs a SQL round-trip plus serialization. The
+# cache holds already-serialized row dicts keyed on (endpoint, sorted
+# query params), evicting least-recently-used entries once past
+# settings.response_cache_size. Entries have no TTL and data loads can
+# run against the database out of band, so the cache defaults to off
+# (size 0); opt in only where the data is immutable for the process
+# lifetime, and call clear_response_caches() after any reload.
+_response_cache = OrderedDict()
+
+
+def _response_cache_get(endpoint, params):
+    """Return (key, cached-rows-or-None) for one endpoint invocation."""
+    key = (endpoint, tuple(sorted((k, v) for k, v in params.items() if v is not None)))
+    if not settings.response_cache_size:
+        return key, None
+    cached = _response_cache.get(key)
+    if cached is not None:
+        _response_cache.move_to_end(key)
+    return key, cached
+
+
+def _response_cache_put(key, rows):
+    """Store one serialized response, evicting the LRU entry when full."""
+    if not settings.response_cache_size:
+        return
+    _response_cache[key] = rows
+    if len(_response_cache) > settings.response_cache_size:
+        _response_cache.popitem(last=False)
+
+
+def clear_response_caches():
+    """Drop all cached responses (call after loading new data)."""
+    _response_cache.clear()
+    _stats_cache["t"] = 0.0
+    _stats_cache["v"] = None
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
     Root endpoint providing API information.
-    
+
     Returns:
         dict: API information including name, version, and available endpoints
     """
-    return {
-        "message": f"Welcome to {settings.app_name}",
-        "version": settings.app_version,
-        "docs": "/docs",
-        "ui": "/ui",
-        "graphql": "/graphql" if GRAPHQL_AVAILABLE else "Not available (install Rust and strawberry-graphql)",
-        "endpoints": {
-            "banks": "/api/banks",
-            "branches": "/api/branches",
-            "health": "/health",
-            "ui": "/ui"
-        }
-    }
+    return _ROOT_RESPONSE
 
 
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
     Health check endpoint.
-    
+
     Returns:
         dict: Health status of the API
     """
-    return {"status": "healthy", "version": settings.app_version}
+    return _HEALTH_RESPONSE
 
 
 @app.get("/api/banks", response_model=List[schemas.Bank], tags=["Banks"])
 async def list_banks(
     page: int = Query(1, ge=1, description="Page number (starting from 1)"),
-    page_size: int = Query(50, ge=1, le=100, description="Number of items per page"),
+    page_size: int = Query(50, ge=0, le=100, description="Number of items per page (0 = all, max 100)"),
     search: Optional[str] = Query(None, description="Search banks by name"),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve a paginated list of all banks.
-    
+
     Parameters:
         - **page**: Page number (minimum 1)
-        - **page_size**: Number of items per page (1-100)
+        - **page_size**: Number of items per page (1-100, 0 = all)
         - **search**: Optional search term to filter banks by name
-        
+
     Returns:
         List of banks with their details
     """
-    skip = (page - 1) * page_size
-    banks = crud.get_banks(db, skip=skip, limit=page_size, search=search)
-    return banks
+    # If page_size is 0, return all matching results (ignore page); the
+    # banks table is small, so one round-trip beats paginating client-side
+    if page_size == 0:
+        skip = 0
+        limit = None
+    else:
+        skip = (page - 1) * page_size
+        limit = page_size
+
+    key, cached = _response_cache_get(
+        "/api/banks", {"page": page, "page_size": page_size, "search": search}
+    )
+    if cached is not None:
+        return ORJSONResponse(cached)
+
+    banks = crud.get_banks(db, skip=skip, limit=limit, search=search)
+    rows = [{"name": b.name, "id": b.id} for b in banks]
+    _response_cache_put(key, rows)
+    return ORJSONResponse(rows)
 
 
 @app.get("/api/banks/{bank_id}", response_model=schemas.Bank, tags=["Banks"])
@@ -201,11 +351,6 @@ async def get_bank_branches(
     Raises:
         HTTPException: 404 if bank not found
     """
-    # Check if bank exists
-    bank = crud.get_bank(db, bank_id=bank_id)
-    if bank is None:
-        raise HTTPException(status_code=404, detail="Bank not found")
-    
     # interpret page_size == 0 as no limit (return all matching)
     if page_size == 0:
         skip = 0
@@ -214,6 +359,13 @@ async def get_bank_branches(
         skip = (page - 1) * page_size
         limit = page_size
 
+    key, cached = _response_cache_get(
+        "/api/banks/{bank_id}/branches",
+        {"bank_id": bank_id, "page": page, "page_size": page_size, "city": city, "state": state}
+    )
+    if cached is not None:
+        return ORJSONResponse(cached)
+
     branches = crud.get_branches(
         db,
         skip=skip,
@@ -222,7 +374,15 @@ async def get_bank_branches(
         city=city,
         state=state
     )
-    return branches
+
+    # Only hit the banks table when the result is empty, to distinguish
+    # "bank does not exist" (404) from "no branches match the filters"
+    if not branches and not crud.bank_exists(db, bank_id=bank_id):
+        raise HTTPException(status_code=404, detail="Bank not found")
+
+    rows = _branch_rows(branches, with_bank=False)
+    _response_cache_put(key, rows)
+    return ORJSONResponse(rows)
 
 
 @app.get("/api/branches", response_model=List[schemas.BranchWithBank], tags=["Branches"])
@@ -235,11 +395,12 @@ async def list_branches(
     district: Optional[str] = Query(None, description="Filter by district"),
     state: Optional[str] = Query(None, description="Filter by state"),
     search: Optional[str] = Query(None, description="Search in branch name, address, or IFSC"),
+    after_ifsc: Optional[str] = Query(None, description="Keyset cursor: return branches with IFSC after this value (replaces page)"),
     db: Session = Depends(get_db)
 ):
     """
     Retrieve a paginated list of branches with optional filters.
-    
+
     Parameters:
         - **page**: Page number (minimum 1)
         - **page_size**: Number of items per page (1-100)
@@ -248,7 +409,9 @@ async def list_branches(
         - **district**: Optional filter by district (case-insensitive)
         - **state**: Optional filter by state (case-insensitive)
         - **search**: Optional search term for branch name, address, or IFSC
-        
+        - **after_ifsc**: Optional keyset cursor; results are ordered by IFSC
+          and start after this value (constant-time regardless of depth)
+
     Returns:
         List of branches with bank details
         
@@ -265,6 +428,17 @@ async def list_branches(
         skip = (page - 1) * page_size
         limit = page_size
 
+    key, cached = _response_cache_get(
+        "/api/branches",
+        {
+            "page": page, "page_size": page_size, "bank_id": bank_id,
+            "bank_name": bank_name, "city": city, "district": district,
+            "state": state, "search": search, "after_ifsc": after_ifsc
+        }
+    )
+    if cached is not None:
+        return ORJSONResponse(cached)
+
     branches = crud.get_branches(
         db,
         skip=skip,
@@ -274,9 +448,12 @@ async def list_branches(
         city=city,
         district=district,
         state=state,
-        search=search
+        search=search,
+        after_ifsc=after_ifsc
     )
-    return branches
+    rows = _branch_rows(branches)
+    _response_cache_put(key, rows)
+    return ORJSONResponse(rows)
 
 
 @app.get("/api/branches/count", tags=["Branches"])
@@ -318,6 +495,50 @@ def export_branches_csv(
 ):
     """Stream CSV export of branches matching filters."""
 
+    def copy_row_generator():
+        # Postgres fast path: COPY formats the CSV inside the database and
+        # streams it through the driver, skipping the ORM and csv.writer
+        # entirely. cursor.copy() is psycopg 3 API, so this path is only
+        # taken when the engine runs on that driver (postgresql+psycopg://
+        # URLs); see the generator selection below.
+        where = []
+        params = []
+        if bank_id:
+            where.append("b.bank_id = %s")
+            params.append(bank_id)
+        if bank_name:
+            where.append("lower(k.name) = %s")
+            params.append(bank_name.lower())
+        if city:
+            where.append("lower(b.city) = %s")
+            params.append(city.lower())
+        if district:
+            where.append("lower(b.district) = %s")
+            params.append(district.lower())
+        if state:
+            where.append("lower(b.state) = %s")
+            params.append(state.lower())
+        if search:
+            where.append("(b.branch ILIKE %s OR b.address ILIKE %s OR b.ifsc ILIKE %s)")
+            params.extend([f"%{search}%"] * 3)
+
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+        copy_sql = (
+            "COPY (SELECT b.ifsc, b.bank_id, k.name AS bank_name, b.branch, "
+            "b.address, b.city, b.district, b.state "
+            "FROM branches b JOIN banks k ON b.bank_id = k.id"
+            f"{where_sql}) TO STDOUT WITH CSV HEADER"
+        )
+
+        raw_conn = engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            with cursor.copy(copy_sql, params) as copy:
+                for chunk in copy:
+                    yield bytes(chunk)
+        finally:
+            raw_conn.close()
+
     def row_generator():
         # Header
         header = ['ifsc','bank_id','bank_name','branch','address','city','district','state']
@@ -328,46 +549,44 @@ def export_branches_csv(
         sio.seek(0)
         sio.truncate(0)
 
-        # Fetch all matching rows in batches to avoid loading entire table
-        batch_size = 1000
-        offset = 0
-        while True:
-            rows = crud.get_branches(
-                db,
-                skip=offset,
-                limit=batch_size,
-                bank_id=bank_id,
-                bank_name=bank_name,
-                city=city,
-                district=district,
-                state=state,
-                search=search
-            )
-            if not rows:
-                break
-            for r in rows:
-                # r.bank may be lazy-loaded; ensure name available
-                bankname = getattr(r.bank, 'name', '') if r.bank is not None else ''
-                writer.writerow([
-                    r.ifsc,
-                    r.bank_id,
-                    bankname,
-                    r.branch or '',
-                    r.address or '',
-                    r.city or '',
-                    r.district or '',
-                    r.state or ''
-                ])
-                yield sio.getvalue()
-                sio.seek(0)
-                sio.truncate(0)
-
-            if len(rows) < batch_size:
-                break
-            offset += batch_size
+        # Stream all matching rows from one server-side cursor (yield_per
+        # batches of 1000) instead of re-running the query per OFFSET page
+        for r in crud.iter_branches(
+            db,
+            bank_id=bank_id,
+            bank_name=bank_name,
+            city=city,
+            district=district,
+            state=state,
+            search=search
+        ):
+            bankname = getattr(r.bank, 'name', '') if r.bank is not None else ''
+            writer.writerow([
+                r.ifsc,
+                r.bank_id,
+                bankname,
+                r.branch or '',
+                r.address or '',
+                r.city or '',
+                r.district or '',
+                r.state or ''
+            ])
+            yield sio.getvalue()
+            sio.seek(0)
+            sio.truncate(0)
 
     filename = "branches_export.csv"
-    return StreamingResponse(row_generator(), media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={filename}"})
+    # The COPY path needs psycopg 3 (cursor.copy); plain postgresql://
+    # URLs resolve to psycopg2, which falls back to the ORM streamer
+    use_copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg"
+    generator = copy_row_generator if use_copy else row_generator
+    return StreamingResponse(generator(), media_type="text/csv", headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+
+# IFSC format: 4 bank letters, a literal '0', 6 alphanumerics. Compiled
+# once at import so each request pays a single regex match instead of
+# chained length/charset checks.
+IFSC_RE = re.compile(r"^[A-Z]{4}0[A-Z0-9]{6}$")
 
 
 @app.get("/api/branches/{ifsc}", response_model=schemas.BranchWithBank, tags=["Branches"])
@@ -390,44 +609,65 @@ async def get_branch(
     Example:
         - Get branch by IFSC: `/api/branches/SBIN0000001`
     """
-    if len(ifsc) != 11:
+    # Canonicalize once so the case variants share one cache entry, then
+    # reject malformed codes before touching the database
+    ifsc = ifsc.upper()
+    if IFSC_RE.match(ifsc) is None:
         raise HTTPException(
-            status_code=400, 
-            detail="IFSC code must be exactly 11 characters"
+            status_code=400,
+            detail="IFSC code must be exactly 11 characters (4 letters, '0', 6 letters or digits)"
         )
-    
+
+    key, cached = _response_cache_get("/api/branches/{ifsc}", {"ifsc": ifsc})
+    if cached is not None:
+        return ORJSONResponse(cached)
+
     branch = crud.get_branch(db, ifsc=ifsc)
     if branch is None:
         raise HTTPException(status_code=404, detail="Branch not found")
-    return branch
+
+    row = _branch_rows([branch])[0]
+    _response_cache_put(key, row)
+    return ORJSONResponse(row)
+
+
+# /api/stats cache: the two COUNT(*) queries walk entire indexes and the
+# totals only change on data loads, so re-serving them for a short TTL
+# (settings.stats_cache_ttl) turns repeated tab switches into dict reads
+_stats_cache = {"t": 0.0, "v": None}
 
 
 @app.get("/api/stats", tags=["Statistics"])
 async def get_statistics(db: Session = Depends(get_db)):
     """
     Get overall statistics about banks and branches.
-    
+
+    Results are cached in memory for settings.stats_cache_ttl seconds
+    (0 disables caching).
+
     Returns:
         Statistics including total banks and branches
     """
+    ttl = settings.stats_cache_ttl
+    now = time.monotonic()
+    if ttl and _stats_cache["v"] is not None and now - _stats_cache["t"] < ttl:
+        return _stats_cache["v"]
+
     total_banks = crud.get_banks_count(db)
     total_branches = crud.get_branches_count(db)
-    
-    return {
+
+    result = {
         "total_banks": total_banks,
         "total_branches": total_branches
     }
+    _stats_cache["t"] = now
+    _stats_cache["v"] = result
+    return result
 
 
-@app.get("/ui", response_class=HTMLResponse, tags=["UI"])
-async def ui_page():
-    """
-    Enhanced UI page for browsing banks and branches.
-    
-    Returns:
-        HTML page with interactive UI
-    """
-    html_content = """
+def _ui_html() -> str:
+    """Render the static UI page markup (built once at import time)."""
+    return """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -783,7 +1023,94 @@ async def ui_page():
         <script>
             let currentPage = 1;
             const defaultPageSize = 20;
+            const maxRenderedRows = 1500;  // live DOM rows kept while lazy-loading branches
             let lastResults = [];
+            let debounceTimer = null;
+            let searchController = null;  // aborts the previous in-flight search
+            const countCache = new Map();  // filter-params string -> count response
+
+            // Tiny IndexedDB key-value cache (no external deps) so revisits
+            // to the stats drill-downs skip the network entirely
+            const IDB_NAME = 'bank-api-cache';
+            const IDB_STORE = 'responses';
+            const IDB_MAX_ENTRIES = 200;
+            let idbPromise = null;
+            function idbOpen() {
+                if (!idbPromise) {
+                    idbPromise = new Promise((resolve, reject) => {
+                        const req = indexedDB.open(IDB_NAME, 1);
+                        req.onupgradeneeded = () => req.result.createObjectStore(IDB_STORE);
+                        req.onsuccess = () => resolve(req.result);
+                        req.onerror = () => reject(req.error);
+                    });
+                }
+                return idbPromise;
+            }
+            async function idbGet(key) {
+                try {
+                    const db = await idbOpen();
+                    return await new Promise((resolve, reject) => {
+                        const req = db.transaction(IDB_STORE).objectStore(IDB_STORE).get(key);
+                        req.onsuccess = () => resolve(req.result);
+                        req.onerror = () => reject(req.error);
+                    });
+                } catch (e) { return undefined; }
+            }
+            async function idbSet(key, value) {
+                try {
+                    const db = await idbOpen();
+                    const store = db.transaction(IDB_STORE, 'readwrite').objectStore(IDB_STORE);
+                    store.put({t: Date.now(), v: value}, key);
+                    // Evict the oldest entries once past the cap
+                    const countReq = store.count();
+                    countReq.onsuccess = () => {
+                        if (countReq.result <= IDB_MAX_ENTRIES) return;
+                        const entries = [];
+                        store.openCursor().onsuccess = (ev) => {
+                            const cur = ev.target.result;
+                            if (cur) {
+                                entries.push([cur.key, cur.value.t]);
+                                cur.continue();
+                            } else {
+                                entries.sort((a, b) => a[1] - b[1]);
+                                const evictStore = db.transaction(IDB_STORE, 'readwrite').objectStore(IDB_STORE);
+                                entries.slice(0, entries.length - IDB_MAX_ENTRIES).forEach(([k]) => evictStore.delete(k));
+                            }
+                        };
+                    };
+                } catch (e) { /* cache is best-effort */ }
+            }
+
+            // Stale-while-revalidate fetch: serve the cached copy
+            // immediately when present and refresh it in the background
+            async function cachedFetchJson(url) {
+                const cached = await idbGet(url);
+                const refresh = fetch(url)
+                    .then(r => r.json())
+                    .then(data => { idbSet(url, data); return data; });
+                if (cached !== undefined) {
+                    refresh.catch(() => {});
+                    return cached.v;
+                }
+                return refresh;
+            }
+
+            // Batch DOM writes into one animation frame so rapid fetch
+            // completions trigger a single layout/paint instead of one each
+            let rafPending = false;
+            let pendingWrites = [];
+            function scheduleWrite(fn) {
+                pendingWrites.push(fn);
+                if (!rafPending) {
+                    rafPending = true;
+                    requestAnimationFrame(() => {
+                        const writes = pendingWrites;
+                        pendingWrites = [];
+                        rafPending = false;
+                        writes.forEach(f => f());
+                    });
+                }
+            }
             
             function switchTab(tabName) {
                 document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
@@ -796,89 +1123,127 @@ async def ui_page():
                 }
             }
             
-            async function searchBranches() {
-                const search = document.getElementById('searchInput').value;
+            // Collect the current filter inputs once; shared by the search,
+            // count, drill-down and export paths
+            function buildFilterParams() {
+                const params = new URLSearchParams();
                 const bankId = document.getElementById('bankIdFilter').value;
                 const bank = document.getElementById('bankFilter').value;
                 const city = document.getElementById('cityFilter').value;
                 const state = document.getElementById('stateFilter').value;
+                const search = document.getElementById('searchInput').value;
+                if (bankId) params.append('bank_id', bankId);
+                if (bank) params.append('bank_name', bank);
+                if (city) params.append('city', city);
+                if (state) params.append('state', state);
+                if (search) params.append('search', search);
+                return params;
+            }
+
+            async function searchBranches() {
                 const showAll = document.getElementById('showAllCheckbox').checked;
                 // If showAll is checked, request page_size=0 which our API interprets as "all"
                 const pageSize = showAll ? 0 : defaultPageSize;
-                let url = `/api/branches?page=${currentPage}&page_size=${pageSize}`;
-                if (search) url += `&search=${encodeURIComponent(search)}`;
-                if (bankId) url += `&bank_id=${encodeURIComponent(bankId)}`;
-                if (bank) url += `&bank_name=${encodeURIComponent(bank)}`;
-                if (city) url += `&city=${encodeURIComponent(city)}`;
-                if (state) url += `&state=${encodeURIComponent(state)}`;
-                
+                const params = buildFilterParams();
+                const listParams = new URLSearchParams(params);
+                listParams.append('page', currentPage);
+                listParams.append('page_size', pageSize);
+                const url = '/api/branches?' + listParams.toString();
+
                 document.getElementById('restResults').innerHTML = '<div class="loading">Loading...</div>';
-                
+
+                // Abort any search still in flight: its results would be
+                // thrown away anyway
+                if (searchController) searchController.abort();
+                searchController = new AbortController();
+                const signal = searchController.signal;
+
                 try {
-                    const response = await fetch(url);
-                        const data = await response.json();
-                        lastResults = data || [];
-                        // update resultInfo via count endpoint when possible
-                        try {
-                            const params = new URLSearchParams();
-                            if (bankId) params.append('bank_id', bankId);
-                            if (bank) params.append('bank_name', bank);
-                            if (city) params.append('city', city);
-                            if (state) params.append('state', state);
-                            if (search) params.append('search', search);
-                            const countResp = await fetch('/api/branches/count?' + params.toString());
-                            const countData = await countResp.json();
-                            const total = (countData && typeof countData.count === 'number') ? countData.count : ((lastResults && lastResults.length) || 0);
-                            const resultInfoEl = document.getElementById('resultInfo');
-                            if (resultInfoEl) resultInfoEl.innerText = `${total} branches found`;
-                        } catch (e) {
-                            const total = (lastResults && lastResults.length) || 0;
-                            const resultInfoEl = document.getElementById('resultInfo');
-                            if (resultInfoEl) resultInfoEl.innerText = `${total} results`;
-                        }
+                    // Fire the search and the count in parallel; the count is the
+                    // slowest query so memoize it per filter combination
+                    const countKey = params.toString();
+                    const countPromise = countCache.has(countKey)
+                        ? Promise.resolve(countCache.get(countKey))
+                        : fetch('/api/branches/count?' + countKey, {signal})
+                            .then(r => r.json())
+                            .then(c => { countCache.set(countKey, c); return c; })
+                            .catch(() => null);
+                    const [data, countData] = await Promise.all([
+                        fetch(url, {signal}).then(r => r.json()),
+                        countPromise
+                    ]);
+                    lastResults = data || [];
+                    const total = (countData && typeof countData.count === 'number') ? countData.count : ((lastResults && lastResults.length) || 0);
+                    scheduleWrite(() => {
+                        const resultInfoEl = document.getElementById('resultInfo');
+                        if (resultInfoEl) resultInfoEl.innerText = `${total} branches found`;
                         displayResults(data);
                         const downloadBtn = document.getElementById('downloadCsvBtn');
                         if (downloadBtn) downloadBtn.disabled = !(lastResults && lastResults.length > 0);
+                    });
                 } catch (error) {
+                    if (error.name === 'AbortError') return;  // superseded by a newer search
                     document.getElementById('restResults').innerHTML = `<div class="error">Error: ${error.message}</div>`;
                 }
             }
             
+            // Build a labelled detail line without interpolating data into
+            // markup: textContent never reaches the HTML tokenizer, so
+            // branch fields can't inject tags (and render faster too)
+            function detailLine(label, value) {
+                const p = document.createElement('p');
+                const strong = document.createElement('strong');
+                strong.textContent = label + ':';
+                p.appendChild(strong);
+                p.appendChild(document.createTextNode(' ' + value));
+                return p;
+            }
+
             function displayResults(branches) {
                 const container = document.getElementById('restResults');
                 if (branches.length === 0) {
                     container.innerHTML = '<div class="loading">No branches found</div>';
                     return;
                 }
-                
-                container.innerHTML = branches.map(branch => `
-                    <div class="result-item">
-                        <h3>${branch.branch || branch.ifsc}</h3>
-                        <p><strong>IFSC:</strong> ${branch.ifsc}</p>
-                        <p><strong>Bank:</strong> ${branch.bank.name}</p>
-                        <p><strong>Address:</strong> ${branch.address || 'N/A'}</p>
-                        <p><strong>City:</strong> ${branch.city || 'N/A'}</p>
-                        <p><strong>State:</strong> ${branch.state || 'N/A'}</p>
-                    </div>
-                `).join('');
+
+                const frag = document.createDocumentFragment();
+                branches.forEach(branch => {
+                    const el = document.createElement('div');
+                    el.className = 'result-item';
+                    const h3 = document.createElement('h3');
+                    h3.textContent = branch.branch || branch.ifsc;
+                    el.appendChild(h3);
+                    el.appendChild(detailLine('IFSC', branch.ifsc));
+                    el.appendChild(detailLine('Bank', branch.bank.name));
+                    el.appendChild(detailLine('Address', branch.address || 'N/A'));
+                    el.appendChild(detailLine('City', branch.city || 'N/A'));
+                    el.appendChild(detailLine('State', branch.state || 'N/A'));
+                    frag.appendChild(el);
+                });
+                container.replaceChildren(frag);
             }
 
             // Download CSV via server exporter using current filters
-            function downloadCSV() {
-                const search = document.getElementById('searchInput').value;
-                const bankId = document.getElementById('bankIdFilter').value;
-                const bank = document.getElementById('bankFilter').value;
-                const city = document.getElementById('cityFilter').value;
-                const state = document.getElementById('stateFilter').value;
-                const params = new URLSearchParams();
-                if (bankId) params.append('bank_id', bankId);
-                if (bank) params.append('bank_name', bank);
-                if (city) params.append('city', city);
-                if (state) params.append('state', state);
-                if (search) params.append('search', search);
-                // open export URL - browser will download
-                const url = '/api/branches/export?' + params.toString();
-                window.location = url;
+            async function downloadCSV() {
+                const url = '/api/branches/export?' + buildFilterParams().toString();
+                // Stream the response straight to disk where the File System
+                // Access API is available, so large exports never buffer in
+                // memory; otherwise fall back to a plain navigation download
+                if (!window.showSaveFilePicker) {
+                    window.location = url;
+                    return;
+                }
+                try {
+                    const handle = await showSaveFilePicker({
+                        suggestedName: 'branches_export.csv',
+                        types: [{description: 'CSV file', accept: {'text/csv': ['.csv']}}]
+                    });
+                    const writable = await handle.createWritable();
+                    const resp = await fetch(url);
+                    await resp.body.pipeTo(writable);
+                } catch (e) {
+                    if (e.name !== 'AbortError') window.location = url;
+                }
             }
 
             let statsPageData = null;  // Track pagination state
@@ -896,21 +1261,29 @@ async def ui_page():
                 } catch (e) {}
                 const container = document.getElementById('statsContainer');
                 container.innerHTML = '<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div><div class="loading">Loading banks...</div>';
-                let page = 1;
-                const page_size = 100;
-                let all = [];
-                while (true) {
-                    const resp = await fetch(`/api/banks?page=${page}&page_size=${page_size}`);
-                    const data = await resp.json();
-                    if (!data || data.length === 0) break;
-                    all = all.concat(data);
-                    if (data.length < page_size) break;
-                    page += 1;
-                }
+                // page_size=0 means "all": one round-trip instead of a
+                // sequential paginate-until-empty loop
+                const all = (await cachedFetchJson('/api/banks?page_size=0')) || [];
                 lastResults = all;
-                const downloadBtn = document.getElementById('downloadCsvBtn');
-                if (downloadBtn) downloadBtn.disabled = !(lastResults && lastResults.length > 0);
-                container.innerHTML = `<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div><div class="results">${all.map(b => `<div class="result-item"><h3>${b.name}</h3><p>ID: ${b.id}</p></div>`).join('')}</div>`;
+                scheduleWrite(() => {
+                    const downloadBtn = document.getElementById('downloadCsvBtn');
+                    if (downloadBtn) downloadBtn.disabled = !(lastResults && lastResults.length > 0);
+                    container.innerHTML = '<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div>';
+                    const results = document.createElement('div');
+                    results.className = 'results';
+                    all.forEach(b => {
+                        const el = document.createElement('div');
+                        el.className = 'result-item';
+                        const h3 = document.createElement('h3');
+                        h3.textContent = b.name;
+                        const p = document.createElement('p');
+                        p.textContent = 'ID: ' + b.id;
+                        el.appendChild(h3);
+                        el.appendChild(p);
+                        results.appendChild(el);
+                    });
+                    container.appendChild(results);
+                });
             }
 
             // Show all branches - paginated lazy-loading for performance
@@ -924,20 +1297,9 @@ async def ui_page():
                 
                 try {
                     // get count with filters currently set in the UI
-                    const params = new URLSearchParams();
-                    const search = document.getElementById('searchInput').value;
-                    const bankId = document.getElementById('bankIdFilter').value;
-                    const bank = document.getElementById('bankFilter').value;
-                    const city = document.getElementById('cityFilter').value;
-                    const state = document.getElementById('stateFilter').value;
-                    if (bankId) params.append('bank_id', bankId);
-                    if (bank) params.append('bank_name', bank);
-                    if (city) params.append('city', city);
-                    if (state) params.append('state', state);
-                    if (search) params.append('search', search);
-                    
-                    const respCount = await fetch('/api/branches/count?' + params.toString());
-                    const countData = await respCount.json();
+                    const params = buildFilterParams();
+
+                    const countData = await cachedFetchJson('/api/branches/count?' + params.toString());
                     const total = (countData && typeof countData.count === 'number') ? countData.count : 0;
                     
                     if (total > 5000) {
@@ -947,61 +1309,156 @@ async def ui_page():
                         }
                     }
 
-                    // Lazy-load branches using pagination 
+                    // Lazy-load branches with a keyset cursor: each page
+                    // seeks to the last seen IFSC via the PK index, so deep
+                    // pages avoid the O(offset) row-skipping of page numbers
                     statsPageData = {
                         params: params,
-                        currentPage: 1,
+                        lastIfsc: '',  // empty cursor = from the beginning
                         pageSize: 500,  // larger page size for faster loading
                         total: total,
                         loaded: 0,
+                        firstRendered: 0,  // index into branches[] of the first row still in the DOM
                         branches: []
                     };
                     
-                    container.innerHTML = `<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div><div class="results" id="branchList" style=""></div><div id="loadMoreContainer" style="text-align:center; padding:20px;"><button class="btn" onclick="loadMoreBranches()">Load More</button></div>`;
-                    
+                    container.innerHTML = `<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div><div class="results" id="branchList" style=""><div id="rowSpacer"></div></div><div id="loadMoreContainer" style="text-align:center; padding:20px;"><button class="btn" onclick="loadMoreBranches()">Load More</button></div><div id="scrollSentinel"></div>`;
+
+                    // Auto-load the next page as the user scrolls near the
+                    // bottom instead of requiring a click per page
+                    const sentinel = document.getElementById('scrollSentinel');
+                    new IntersectionObserver(entries => {
+                        if (entries[0].isIntersecting) loadMoreBranches();
+                    }, {rootMargin: '400px'}).observe(sentinel);
+
+                    // ...and re-render earlier rows when the user scrolls
+                    // back up into the spacer left by the row windowing
+                    new IntersectionObserver(entries => {
+                        if (entries[0].isIntersecting) restoreEarlierRows();
+                    }, {rootMargin: '400px'}).observe(document.getElementById('rowSpacer'));
+
                     await loadMoreBranches();
                 } catch (e) {
                     container.innerHTML = `<div class="stats-header"><button class="back-btn" onclick="reloadStats()">← Back</button></div><div class="error">Error: ${(e.message || e)}</div>`;
                 }
             }
 
-            async function loadMoreBranches() {
-                if (!statsPageData) return;
-                
-                const container = document.getElementById('branchList');
+            function branchRow(b) {
+                const el = document.createElement('div');
+                el.className = 'result-item';
+                el.style.marginBottom = '10px';
+                const h3 = document.createElement('h3');
+                h3.textContent = b.branch || b.ifsc;
+                const p = document.createElement('p');
+                p.textContent = `${(b.bank && b.bank.name) || ''} — ${b.city || ''}, ${b.state || ''}`;
+                el.appendChild(h3);
+                el.appendChild(p);
+                return el;
+            }
+
+            // Re-render rows above the current window from
+            // statsPageData.branches (the source of truth) when the user
+            // scrolls back into the spacer, shrinking it by the measured
+            // height of the restored rows so the scroll position holds
+            function restoreEarlierRows() {
+                if (!statsPageData || !statsPageData.firstRendered) return;
+                const spacer = document.getElementById('rowSpacer');
+                if (!spacer) return;
+                const end = statsPageData.firstRendered;
+                const start = Math.max(0, end - 200);
+                const frag = document.createDocumentFragment();
+                statsPageData.branches.slice(start, end).forEach(b => frag.appendChild(branchRow(b)));
+                spacer.after(frag);
+                statsPageData.firstRendered = start;
+                let restored = 0;
+                let node = spacer.nextElementSibling;
+                for (let i = start; i < end && node; i++, node = node.nextElementSibling) {
+                    restored += node.offsetHeight + 10;  // + the 10px marginBottom
+                }
+                const remaining = Math.max(0, (parseFloat(spacer.style.height) || 0) - restored);
+                spacer.style.height = (start === 0 ? 0 : remaining) + 'px';
+            }
+
+            function branchesPageUrl(afterIfsc) {
                 const params = new URLSearchParams(statsPageData.params);
-                params.append('page', statsPageData.currentPage);
+                params.append('after_ifsc', afterIfsc);
                 params.append('page_size', statsPageData.pageSize);
-                
+                return '/api/branches?' + params.toString();
+            }
+
+            async function loadMoreBranches() {
+                if (!statsPageData || statsPageData.loading) return;
+                statsPageData.loading = true;
+
+                const container = document.getElementById('branchList');
+
                 try {
-                    const resp = await fetch('/api/branches?' + params.toString());
-                    const data = await resp.json();
-                    
+                    // Use the speculatively prefetched response when one is
+                    // already in flight for this page
+                    const data = await (statsPageData.prefetch || cachedFetchJson(branchesPageUrl(statsPageData.lastIfsc)));
+                    statsPageData.prefetch = null;
+
                     if (!data || data.length === 0) {
                         document.getElementById('loadMoreContainer').innerHTML = `<p style="color:#666;">Loaded all ${statsPageData.loaded} branches ✓</p>`;
                         return;
                     }
-                    
+
                     statsPageData.branches = statsPageData.branches.concat(data);
                     statsPageData.loaded += data.length;
-                    statsPageData.currentPage += 1;
-                    
-                    // Append new results to existing list
-                    const newHtml = data.map(b => `<div class="result-item" style="margin-bottom:10px;"><h3>${b.branch || b.ifsc}</h3><p>${(b.bank && b.bank.name) || ''} — ${b.city || ''}, ${b.state || ''}</p></div>`).join('');
-                    container.innerHTML += newHtml;
+                    statsPageData.lastIfsc = data[data.length - 1].ifsc;
+
+                    // Prefetch the next page while this one renders, hiding
+                    // its network latency behind the paint
+                    if (statsPageData.loaded < statsPageData.total) {
+                        statsPageData.prefetch = cachedFetchJson(branchesPageUrl(statsPageData.lastIfsc));
+                    }
                     
+                    // Append new results as DOM nodes via a fragment:
+                    // innerHTML += would re-serialize and re-parse the whole
+                    // list on every page, which is quadratic in loaded rows
+                    const frag = document.createDocumentFragment();
+                    data.forEach(b => frag.appendChild(branchRow(b)));
+
                     lastResults = statsPageData.branches;
-                    const downloadBtn = document.getElementById('downloadCsvBtn');
-                    if (downloadBtn) downloadBtn.disabled = !(lastResults && lastResults.length > 0);
-                    
-                    // Update load more button
-                    if (statsPageData.loaded >= statsPageData.total) {
-                        document.getElementById('loadMoreContainer').innerHTML = `<p style="color:#666;">Loaded all ${statsPageData.total} branches ✓</p>`;
-                    } else {
-                        document.getElementById('loadMoreContainer').innerHTML = `<button class="btn" onclick="loadMoreBranches()">Load More (${statsPageData.loaded}/${statsPageData.total})</button>`;
-                    }
+                    scheduleWrite(() => {
+                        container.appendChild(frag);
+
+                        // Window the rendered rows: the full result set stays
+                        // in statsPageData.branches, but only the most recent
+                        // maxRenderedRows remain in the DOM. Rows scrolled far
+                        // above the viewport are removed and their height
+                        // folded into a leading spacer, keeping scrollbar and
+                        // position stable — otherwise the observer-driven
+                        // auto-pagination would grow the DOM without bound.
+                        // restoreEarlierRows re-renders them on scroll-up.
+                        const spacer = document.getElementById('rowSpacer');
+                        let excess = container.children.length - 1 - maxRenderedRows;
+                        let reclaimed = 0;
+                        while (excess-- > 0) {
+                            const row = spacer.nextElementSibling;
+                            if (!row) break;
+                            reclaimed += row.offsetHeight + 10;  // + the 10px marginBottom
+                            row.remove();
+                            statsPageData.firstRendered++;
+                        }
+                        if (reclaimed) {
+                            spacer.style.height = ((parseFloat(spacer.style.height) || 0) + reclaimed) + 'px';
+                        }
+
+                        const downloadBtn = document.getElementById('downloadCsvBtn');
+                        if (downloadBtn) downloadBtn.disabled = !(lastResults && lastResults.length > 0);
+
+                        // Update load more button
+                        if (statsPageData.loaded >= statsPageData.total) {
+                            document.getElementById('loadMoreContainer').innerHTML = `<p style="color:#666;">Loaded all ${statsPageData.total} branches ✓</p>`;
+                        } else {
+                            document.getElementById('loadMoreContainer').innerHTML = `<button class="btn" onclick="loadMoreBranches()">Load More (${statsPageData.loaded}/${statsPageData.total})</button>`;
+                        }
+                    });
                 } catch (e) {
                     document.getElementById('loadMoreContainer').innerHTML = `<div class="error">Error loading more: ${e.message}</div>`;
+                } finally {
+                    if (statsPageData) statsPageData.loading = false;
                 }
             }
             
@@ -1018,7 +1475,15 @@ async def ui_page():
                         body: JSON.stringify({ query }),
                     });
                     const data = await response.json();
-                    document.getElementById('graphqlResults').innerHTML = `<pre style="background: #f5f5f5; padding: 20px; border-radius: 8px; overflow-x: auto;">${JSON.stringify(data, null, 2)}</pre>`;
+                    scheduleWrite(() => {
+                        // textContent, not innerHTML: JSON.stringify does not
+                        // escape '<', so stored data could otherwise close the
+                        // <pre> and inject markup
+                        const pre = document.createElement('pre');
+                        pre.style.cssText = 'background: #f5f5f5; padding: 20px; border-radius: 8px; overflow-x: auto;';
+                        pre.textContent = JSON.stringify(data, null, 2);
+                        document.getElementById('graphqlResults').replaceChildren(pre);
+                    });
                 } catch (error) {
                     document.getElementById('graphqlResults').innerHTML = `<div class="error">Error: ${error.message}</div>`;
                 }
@@ -1028,7 +1493,7 @@ async def ui_page():
                 try {
                     const response = await fetch('/api/stats');
                     const data = await response.json();
-                    document.getElementById('statsContainer').innerHTML = `
+                    scheduleWrite(() => document.getElementById('statsContainer').innerHTML = `
                         <div class="stat-card" onclick="showBanks()">
                             <h3>${data.total_banks}</h3>
                             <p>Total Banks</p>
@@ -1037,7 +1502,7 @@ async def ui_page():
                             <h3>${data.total_branches}</h3>
                             <p>Total Branches</p>
                         </div>
-                    `;
+                    `);
                 } catch (error) {
                     document.getElementById('statsContainer').innerHTML = `<div class="error">Error: ${error.message}</div>`;
                 }
@@ -1046,22 +1511,50 @@ async def ui_page():
             // Load initial data
             searchBranches();
             
-            // Allow Enter key to search from main search input or bank id input
+            // Allow Enter key to search immediately; debounce plain typing so a
+            // burst of keystrokes issues one request instead of one per key
             ['searchInput','bankIdFilter','bankFilter','cityFilter','stateFilter'].forEach(id => {
                 const el = document.getElementById(id);
                 if (el) {
                     el.addEventListener('keypress', function(e) {
                         if (e.key === 'Enter') {
+                            clearTimeout(debounceTimer);
                             searchBranches();
                         }
                     });
+                    el.addEventListener('input', function() {
+                        clearTimeout(debounceTimer);
+                        debounceTimer = setTimeout(searchBranches, 300);
+                    });
                 }
             });
         </script>
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+
+
+# The UI page is fully static: encode it once and serve the same bytes
+# with an ETag so browsers can revalidate instead of refetching
+_UI_BYTES = _ui_html().encode("utf-8")
+_UI_ETAG = hashlib.md5(_UI_BYTES).hexdigest()
+
+
+@app.get("/ui", response_class=HTMLResponse, tags=["UI"])
+async def ui_page(request: Request):
+    """
+    Enhanced UI page for browsing banks and branches.
+
+    Returns:
+        HTML page with interactive UI (pre-encoded, ETag-revalidated)
+    """
+    if request.headers.get("if-none-match") == _UI_ETAG:
+        return Response(status_code=304, headers={"ETag": _UI_ETAG})
+    return Response(
+        content=_UI_BYTES,
+        media_type="text/html",
+        headers={"ETag": _UI_ETAG, "Cache-Control": "public, max-age=3600"}
+    )
 
 
 if __name__ == "__main__":
@@ -1,9 +1,51 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, BigInteger, String, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, ForeignKey, Index, inspect
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
+class State(Base):
+    """
+    Lookup table of state names referenced by branches.
+
+    Attributes:
+        id: Unique identifier for the state
+        name: Name of the state
+    """
+    __tablename__ = "states"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(26), nullable=False, unique=True)
+
+
+class District(Base):
+    """
+    Lookup table of district names referenced by branches.
+
+    Attributes:
+        id: Unique identifier for the district
+        name: Name of the district
+    """
+    __tablename__ = "districts"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+
+class City(Base):
+    """
+    Lookup table of city names referenced by branches.
+
+    Attributes:
+        id: Unique identifier for the city
+        name: Name of the city
+    """
+    __tablename__ = "cities"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+
 class Bank(Base):
     """
     Bank model representing the banks table.
@@ -37,7 +79,14 @@ class Branch(Base):
         bank: Relationship to Bank model
     """
     __tablename__ = "branches"
-    
+
+    # SQLite picks at most one index per table scan, so the common
+    # bank+location filter combination gets a composite index that serves
+    # it with a single seek instead of an index scan plus row filtering
+    __table_args__ = (
+        Index("ix_branches_bankid_city_state", "bank_id", "city", "state"),
+    )
+
     ifsc = Column(String(11), primary_key=True, index=True)
     bank_id = Column(BigInteger, ForeignKey("banks.id"), nullable=False, index=True)
     branch = Column(String(74))
@@ -45,6 +94,54 @@ class Branch(Base):
     city = Column(String(50), index=True)
     district = Column(String(50))
     state = Column(String(26))
+
+    # Dimensional references into the lookup tables above. The plain string
+    # columns are kept so API responses and filters are unchanged; the int
+    # columns give a far smaller, cache-friendlier index for location scans.
+    city_id = Column(Integer, ForeignKey("cities.id"), index=True)
+    district_id = Column(Integer, ForeignKey("districts.id"))
+    state_id = Column(Integer, ForeignKey("states.id"))
     
     # Relationship with bank
     bank = relationship("Bank", back_populates="branches")
+
+
+# Branch columns added after the first release, with the lookup table and
+# denormalized string column each id backfills from
+_BRANCH_ID_COLUMNS = (
+    ("city_id", "cities", "city"),
+    ("district_id", "districts", "district"),
+    ("state_id", "states", "state"),
+)
+
+
+def upgrade_schema(engine):
+    """
+    Apply in-place schema upgrades that create_all cannot.
+
+    create_all only creates missing tables, so databases created before
+    the location lookup tables lack the branches id columns and would
+    fail with "no such column" on any query that selects or filters
+    them. Adds the missing columns (and the city_id index), then
+    backfills NULL ids from the lookup tables by name — so rows inserted
+    before the lookups were populated (e.g. by the sample loader) show
+    up in id-based filters after a full load. The backfill is a no-op
+    when the lookups are empty or every row is already resolved.
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns("branches")}
+    with engine.begin() as conn:
+        for column, table, _ in _BRANCH_ID_COLUMNS:
+            if column not in existing:
+                conn.exec_driver_sql(
+                    f"ALTER TABLE branches ADD COLUMN {column} INTEGER REFERENCES {table} (id)"
+                )
+        if "city_id" not in existing:
+            conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_branches_city_id ON branches (city_id)"
+            )
+        for column, table, source in _BRANCH_ID_COLUMNS:
+            conn.exec_driver_sql(
+                f"UPDATE branches SET {column} = "
+                f"(SELECT id FROM {table} WHERE {table}.name = branches.{source}) "
+                f"WHERE {column} IS NULL AND branches.{source} IS NOT NULL"
+            )
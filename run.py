@@ -39,13 +39,20 @@ def main():
     print("\nPress CTRL+C to stop the server")
     print("=" * 60)
     
-    # Start server
+    # Start server. Reload mode (with its file watchdog and single worker)
+    # is only enabled when DEV=1; otherwise run one worker per core with
+    # uvloop and the C HTTP parser.
+    dev_mode = os.getenv("DEV") == "1"
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        port=int(os.getenv("PORT", "8000")),
+        reload=dev_mode,
+        workers=1 if dev_mode else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        loop="uvloop",
+        http="httptools",
+        log_level="info",
+        access_log=dev_mode
     )
 
 if __name__ == "__main__":
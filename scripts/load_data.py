@@ -3,11 +3,82 @@ import sys
 import os
 import pandas as pd
 
-# Add parent directory to path to import app modules
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Make the project root importable when run as a script; skipped when the
+# root is already on sys.path (e.g. python -m) so repeated runs don't
+# accumulate duplicate entries for the import machinery to rescan
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
 
-from app.database import SessionLocal, engine
-from app.models import Base, Bank, Branch
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database import engine
+from app.models import Base, Bank, Branch, City, District, State, upgrade_schema
+
+# pyarrow parses CSV in parallel C++ threads; fall back to pandas' parser
+# when it isn't installed
+try:
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Columns we actually load from the CSV, in file order
+CSV_COLUMNS = ['ifsc', 'bank_id', 'bank_name', 'branch', 'address', 'city', 'district', 'state']
+
+# Rows per chunk read from the CSV; keeps peak memory at O(chunk) instead
+# of materializing the whole file as one DataFrame
+CHUNK_SIZE = 50000
+
+
+def _insert_ignore(table):
+    """
+    Build an INSERT that skips rows whose keys already exist.
+
+    Mirrors the SQLite INSERT OR IGNORE dedup on Postgres via
+    ON CONFLICT DO NOTHING, so reruns against a populated database skip
+    existing rows instead of aborting the load with an IntegrityError.
+    Other dialects get a plain INSERT.
+    """
+    if engine.dialect.name == "postgresql":
+        return pg_insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+
+def read_csv_chunks(csv_path):
+    """
+    Yield DataFrame chunks from the CSV file.
+
+    Uses pyarrow's multi-threaded parser when available (the whole file is
+    parsed into a columnar Arrow table, then handed out in record batches);
+    otherwise falls back to pandas' chunked reader.
+    """
+    if PYARROW_AVAILABLE:
+        table = pacsv.read_csv(
+            csv_path,
+            read_options=pacsv.ReadOptions(block_size=8 << 20),
+            # invalid_row_handler mirrors pandas' on_bad_lines='skip'
+            # below: malformed rows are dropped, not fatal
+            parse_options=pacsv.ParseOptions(
+                quote_char='"', escape_char='\\',
+                invalid_row_handler=lambda row: "skip"
+            ),
+            convert_options=pacsv.ConvertOptions(include_columns=CSV_COLUMNS)
+        )
+        for batch in table.to_batches(max_chunksize=CHUNK_SIZE):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(
+            csv_path,
+            chunksize=CHUNK_SIZE,
+            usecols=CSV_COLUMNS,
+            dtype={'bank_id': 'int64', 'ifsc': 'string'},
+            on_bad_lines='skip',  # Skip malformed lines
+            encoding='utf-8',
+            quoting=1,  # QUOTE_ALL
+            escapechar='\\'
+        )
 
 
 def load_data_from_csv():
@@ -16,161 +87,186 @@ def load_data_from_csv():
     # Try root folder first, then data/ folder
     root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     csv_path = os.path.join(root_dir, "bank_branches.csv")
-    
+
     # If not in root, try data folder
     if not os.path.exists(csv_path):
         csv_path = os.path.join(root_dir, "data", "bank_branches.csv")
-    
+
     try:
         # Check if file exists
         if not os.path.exists(csv_path):
             print(f"ERROR: Data file not found at {csv_path}")
             print("\nPlease ensure bank_branches.csv is in the project root or data/ folder")
             sys.exit(1)
-        
-        # Load the data
+
+        # Stream the data in chunks instead of loading the whole file
         print(f"Loading data from {csv_path}...")
-        df = pd.read_csv(
-            csv_path,
-            on_bad_lines='skip',  # Skip malformed lines
-            encoding='utf-8',
-            quoting=1,  # QUOTE_ALL
-            escapechar='\\'
-        )
-        print(f"Loaded {len(df)} records from CSV")
-        
-        # Clean column names (remove any extra spaces)
-        df.columns = df.columns.str.strip()
-        
-        # Remove duplicate IFSCs (keep first occurrence)
-        original_count = len(df)
-        df = df.drop_duplicates(subset=['ifsc'], keep='first')
-        duplicates_removed = original_count - len(df)
-        if duplicates_removed > 0:
-            print(f"Removed {duplicates_removed} duplicate IFSC codes")
-        
-        # Create database tables
+        reader = read_csv_chunks(csv_path)
+
+        # Create database tables, then bring pre-existing ones up to the
+        # current schema (create_all never alters existing tables)
         print("Creating database tables...")
         Base.metadata.create_all(bind=engine)
-        
-        # Create a new database session
-        db = SessionLocal()
-        
-        try:
-            # Extract unique banks
-            print("\nProcessing banks...")
-            banks_df = df[['bank_id', 'bank_name']].drop_duplicates()
-            banks_df = banks_df.rename(columns={'bank_name': 'name', 'bank_id': 'id'})
-            banks_df = banks_df.sort_values('id')
-            
-            # Prepare bank data for bulk insert
-            banks_to_insert = []
-            for _, row in banks_df.iterrows():
-                banks_to_insert.append({
-                    'id': int(row['id']),
-                    'name': row['name']
-                })
-            
-            # Bulk insert banks (skip if already exists)
-            if banks_to_insert:
-                # Check which banks already exist
-                existing_bank_ids = {bank.id for bank in db.query(Bank).all()}
-                new_banks = [b for b in banks_to_insert if b['id'] not in existing_bank_ids]
-                
-                if new_banks:
-                    db.execute(
-                        Bank.__table__.insert(),
-                        new_banks
-                    )
-                    db.commit()
-                    print(f"Loaded {len(new_banks)} new banks (skipped {len(banks_to_insert) - len(new_banks)} existing)")
-                else:
-                    print(f"All {len(banks_to_insert)} banks already exist, skipping...")
-            
-            # Prepare branch data for bulk insert
-            print("\nProcessing branches...")
-            print("This may take a few minutes...")
-            
-            # Check which branches already exist
-            existing_ifscs = {branch.ifsc for branch in db.query(Branch).all()}
-            print(f"Found {len(existing_ifscs)} existing branches in database")
-            
-            branches_to_insert = []
-            batch_size = 5000
+        upgrade_schema(engine)
+
+        # Load everything inside one transaction: on SQLite this means one
+        # fsync for the whole load instead of one per batch
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                # Relax journaling for the duration of the bulk load
+                conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+                conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+                conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+                conn.exec_driver_sql("PRAGMA cache_size=-200000")
+
+            # Drop the secondary branch indexes during the load and rebuild
+            # them once afterwards: a single O(N log N) build each beats a
+            # random B-tree update per inserted row. The implicit unique
+            # index backing the ifsc primary key stays, since INSERT OR
+            # IGNORE dedup relies on it; the explicit ix_branches_ifsc is
+            # redundant with it and safe to defer like the rest.
+            secondary_indexes = ()
+            if engine.dialect.name == "sqlite":
+                secondary_indexes = (
+                    ("ix_branches_ifsc", "CREATE INDEX ix_branches_ifsc ON branches (ifsc)"),
+                    ("ix_branches_bank_id", "CREATE INDEX ix_branches_bank_id ON branches (bank_id)"),
+                    ("ix_branches_bankid_city_state", "CREATE INDEX ix_branches_bankid_city_state ON branches (bank_id, city, state)"),
+                    ("ix_branches_city", "CREATE INDEX ix_branches_city ON branches (city)"),
+                    ("ix_branches_city_id", "CREATE INDEX ix_branches_city_id ON branches (city_id)"),
+                )
+                for index_name, _ in secondary_indexes:
+                    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index_name}")
+
+            # Deduplication (both within the CSV and against existing rows)
+            # is pushed down to the primary-key index via INSERT OR IGNORE,
+            # so no upfront scan of existing rows is needed. On SQLite the
+            # inserts go through the raw DB-API cursor with positional
+            # tuples, skipping SQLAlchemy's per-execute compilation and
+            # dict-based bind processing; the cursor shares the transaction
+            # opened by engine.begin() above.
+            sqlite_raw = engine.dialect.name == "sqlite"
+            if sqlite_raw:
+                cursor = conn.connection.cursor()
+            else:
+                bank_insert = _insert_ignore(Bank.__table__)
+                branch_insert = _insert_ignore(Branch.__table__)
+
+            # In-memory cross-chunk dedup for the small banks table, so the
+            # same ~170 banks aren't re-sent with every chunk
+            seen_bank_ids = set()
+
+            # Location lookup maps (name -> id), seeded from any existing
+            # lookup rows so reruns keep stable IDs
+            lookup_tables = (
+                ('city', City.__table__),
+                ('district', District.__table__),
+                ('state', State.__table__),
+            )
+            lookup_maps = {
+                column: dict(conn.execute(select(table.c.name, table.c.id)).all())
+                for column, table in lookup_tables
+            }
+
+            total_rows = 0
             total_inserted = 0
-            skipped = 0
-            
-            for idx, row in df.iterrows():
-                ifsc = row['ifsc']
-                
-                # Skip if branch already exists
-                if ifsc in existing_ifscs:
-                    skipped += 1
-                    continue
-                
-                branch_data = {
-                    'ifsc': ifsc,
-                    'bank_id': int(row['bank_id']),
-                    'branch': row['branch'] if pd.notna(row['branch']) else None,
-                    'address': row['address'] if pd.notna(row['address']) else None,
-                    'city': row['city'] if pd.notna(row['city']) else None,
-                    'district': row['district'] if pd.notna(row['district']) else None,
-                    'state': row['state'] if pd.notna(row['state']) else None
-                }
-                branches_to_insert.append(branch_data)
-                existing_ifscs.add(ifsc)  # Track inserted IFSC to avoid duplicates in same batch
-                
-                # Bulk insert when batch is ready
-                if len(branches_to_insert) >= batch_size:
-                    try:
-                        db.execute(
-                            Branch.__table__.insert(),
-                            branches_to_insert
+            total_new_banks = 0
+
+            for chunk in reader:
+                # Clean column names (remove any extra spaces)
+                chunk.columns = chunk.columns.str.strip()
+                total_rows += len(chunk)
+
+                # Insert any banks not seen yet; dedup is vectorized
+                # (drop_duplicates + isin) rather than a per-row loop, and
+                # existing DB rows are handled by INSERT OR IGNORE
+                banks_df = chunk[['bank_id', 'bank_name']].drop_duplicates()
+                banks_df = banks_df[~banks_df['bank_id'].isin(seen_bank_ids)].astype(object)
+
+                if len(banks_df):
+                    seen_bank_ids.update(banks_df['bank_id'])
+                    if sqlite_raw:
+                        cursor.executemany(
+                            "INSERT OR IGNORE INTO banks (id, name) VALUES (?, ?)",
+                            list(banks_df.itertuples(index=False, name=None))
                         )
-                        db.commit()
-                        total_inserted += len(branches_to_insert)
-                        print(f"Loaded {total_inserted} branches... (skipped {skipped} existing)")
-                        branches_to_insert = []
-                    except Exception as e:
-                        db.rollback()
-                        print(f"Error inserting batch: {e}")
-                        branches_to_insert = []
-            
-            # Insert remaining branches
-            if branches_to_insert:
-                try:
-                    db.execute(
-                        Branch.__table__.insert(),
-                        branches_to_insert
-                    )
-                    db.commit()
-                    total_inserted += len(branches_to_insert)
-                except Exception as e:
-                    db.rollback()
-                    print(f"Error inserting remaining branches: {e}")
-            
-            print(f"\nTotal branches loaded: {total_inserted}")
-            if skipped > 0:
-                print(f"Skipped {skipped} existing branches")
-            
+                        rowcount = cursor.rowcount
+                    else:
+                        new_banks = banks_df.rename(
+                            columns={'bank_id': 'id', 'bank_name': 'name'}
+                        ).to_dict(orient='records')
+                        rowcount = conn.execute(bank_insert, new_banks).rowcount
+                    total_new_banks += rowcount if rowcount >= 0 else len(banks_df)
+
+                # Resolve the repeated location strings to lookup-table IDs
+                # with a vectorized map per column; new names are appended
+                # to the lookup tables as they appear
+                for column, table in lookup_tables:
+                    name_map = lookup_maps[column]
+                    new_names = [n for n in chunk[column].dropna().unique() if n not in name_map]
+                    if new_names:
+                        next_id = len(name_map) + 1
+                        new_rows = [(next_id + i, n) for i, n in enumerate(new_names)]
+                        if sqlite_raw:
+                            cursor.executemany(
+                                f"INSERT OR IGNORE INTO {table.name} (id, name) VALUES (?, ?)",
+                                new_rows
+                            )
+                        else:
+                            conn.execute(_insert_ignore(table), [{'id': i, 'name': n} for i, n in new_rows])
+                        name_map.update((n, i) for i, n in new_rows)
+                    chunk[f'{column}_id'] = chunk[column].map(name_map).astype('Int64')
+
+                # Convert the chunk to parameter rows in one vectorized pass
+                # (NaN becomes None in pandas' C layer rather than per cell)
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                branch_cols = chunk[['ifsc', 'bank_id', 'branch', 'address', 'city', 'district', 'state',
+                                     'city_id', 'district_id', 'state_id']]
+
+                if len(branch_cols):
+                    if sqlite_raw:
+                        rows = list(branch_cols.itertuples(index=False, name=None))
+                        cursor.executemany(
+                            "INSERT OR IGNORE INTO branches "
+                            "(ifsc, bank_id, branch, address, city, district, state, city_id, district_id, state_id) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows
+                        )
+                        rowcount = cursor.rowcount
+                    else:
+                        rowcount = conn.execute(branch_insert, branch_cols.to_dict(orient='records')).rowcount
+                    total_inserted += rowcount if rowcount >= 0 else len(branch_cols)
+                    print(f"Loaded {total_inserted} branches...")
+
+            # Rebuild the secondary indexes over the fully loaded table
+            if secondary_indexes:
+                print("Rebuilding branch indexes...")
+                for _, create_sql in secondary_indexes:
+                    conn.exec_driver_sql(create_sql)
+
+            print(f"\nProcessed {total_rows} records from CSV")
+            if total_new_banks > 0:
+                print(f"Loaded {total_new_banks} new banks")
+            print(f"Total branches loaded: {total_inserted}")
+            if total_rows > total_inserted:
+                print(f"Skipped {total_rows - total_inserted} duplicate or existing branches")
+
             # Display summary
-            total_banks = db.query(Bank).count()
-            total_branches = db.query(Branch).count()
-            
+            total_banks = conn.execute(select(func.count()).select_from(Bank.__table__)).scalar()
+            total_branches = conn.execute(select(func.count()).select_from(Branch.__table__)).scalar()
+
             print("\n" + "="*50)
             print("Data loading completed successfully!")
             print("="*50)
             print(f"Total Banks in database: {total_banks}")
             print(f"Total Branches in database: {total_branches}")
             print("="*50)
-            
-        except Exception as e:
-            db.rollback()
-            print(f"Error loading data: {e}")
-            raise
-        finally:
-            db.close()
-            
+
+        # Re-run the id backfill now that the lookup tables hold every
+        # name seen in this load, so rows inserted by older loaders
+        # (e.g. the sample data, which leaves the id columns NULL) get
+        # resolved too
+        upgrade_schema(engine)
+
     except Exception as e:
         print(f"Unexpected error: {e}")
         import traceback
@@ -184,8 +280,8 @@ if __name__ == "__main__":
     print("="*50)
     print("\nThis script will load bank branch data from the")
     print("included CSV file into the database.\n")
-    
+
     load_data_from_csv()
-    
+
     print("\nYou can now start the API server using:")
     print("  uvicorn app.main:app --reload")
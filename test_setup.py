@@ -0,0 +1,148 @@
+"""Sanity checks that the project environment is set up correctly.
+
+Run directly (python test_setup.py) for a readable report, or let pytest
+pick the checks up as part of the suite.
+"""
+import importlib
+import importlib.util
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party packages the app needs at runtime
+REQUIRED_MODULES = [
+    "fastapi",
+    "sqlalchemy",
+    "pydantic",
+    "pydantic_settings",
+    "uvicorn",
+]
+
+# Project modules that must import cleanly
+APP_MODULES = [
+    "app.config",
+    "app.database",
+    "app.models",
+    "app.schemas",
+    "app.crud",
+    "app.main",
+]
+
+# Files that must exist for setup/run scripts to work
+FILES_TO_CHECK = [
+    "requirements.txt",
+    "run.py",
+    "setup.py",
+    os.path.join("app", "main.py"),
+    os.path.join("app", "models.py"),
+    os.path.join("app", "schemas.py"),
+    os.path.join("app", "crud.py"),
+    os.path.join("app", "database.py"),
+    os.path.join("app", "config.py"),
+    os.path.join("scripts", "load_data.py"),
+    os.path.join("scripts", "load_sample_data.py"),
+]
+
+
+def _try_import(name):
+    """Import one module, returning (name, error-or-None)."""
+    try:
+        importlib.import_module(name)
+        return name, None
+    except Exception as exc:
+        return name, exc
+
+
+def _find_module(name):
+    """Locate one module without executing it, returning (name, error-or-None)."""
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError) as exc:
+        return name, exc
+    if spec is None:
+        return name, ModuleNotFoundError(f"No module named {name!r}")
+    return name, None
+
+
+def _check_modules(module_names, probe):
+    """Run a module probe over the names on a small thread pool.
+
+    The checks are independent and the GIL is released during the
+    C-extension initialization that dominates cold imports, so running
+    them concurrently hides most of the dynamic-linker latency.
+    """
+    importlib.invalidate_caches()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(probe, module_names))
+    for name, exc in results:
+        print(f"  {'✗' if exc else '✓'} {name}" + (f": {exc}" if exc else ""))
+    return [(name, exc) for name, exc in results if exc is not None]
+
+
+def test_imports():
+    """Check that all required third-party packages can be found.
+
+    find_spec only resolves each package on the import path — it skips
+    executing module code, which for the heavy dependencies is where
+    nearly all the import time goes. The app modules are still imported
+    for real below, which pulls in whatever they actually use.
+    """
+    print("\nChecking dependencies...")
+    failed = _check_modules(REQUIRED_MODULES, _find_module)
+    assert not failed, f"Missing dependencies: {[name for name, _ in failed]}"
+
+
+def test_app_imports():
+    """Check that all project modules import cleanly."""
+    print("\nChecking app modules...")
+    failed = _check_modules(APP_MODULES, _try_import)
+    assert not failed, f"Broken app modules: {[name for name, _ in failed]}"
+
+
+def test_files():
+    """Check that the expected project files are present."""
+    print("\nChecking project files...")
+    root = os.path.dirname(os.path.abspath(__file__))
+    # One scandir per directory instead of one stat syscall per file;
+    # on networked CI filesystems that is 3 round-trips instead of 11
+    found = set()
+    for subdir in ("", "app", "scripts"):
+        try:
+            with os.scandir(os.path.join(root, subdir)) as entries:
+                found.update(
+                    os.path.join(subdir, entry.name) for entry in entries if entry.is_file()
+                )
+        except FileNotFoundError:
+            pass
+    missing = [relpath for relpath in FILES_TO_CHECK if relpath not in found]
+    for relpath in FILES_TO_CHECK:
+        print(f"  {'✗' if relpath in missing else '✓'} {relpath}")
+    assert not missing, f"Missing files: {missing}"
+
+
+def main():
+    """Run all checks and print a summary."""
+    print("=" * 60)
+    print("Bank Branches API - Setup Check")
+    print("=" * 60)
+
+    checks = [test_imports, test_app_imports, test_files]
+    failures = 0
+    for check in checks:
+        try:
+            check()
+        except AssertionError as exc:
+            print(f"✗ {exc}")
+            failures += 1
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"Setup check failed ({failures} problem(s) found)")
+        print("Run: python setup.py")
+    else:
+        print("Setup check passed!")
+        print("Start the server with: python run.py")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
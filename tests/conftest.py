@@ -1,102 +1,252 @@
 """Pytest configuration and fixtures for testing."""
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from app.main import app
+from app.main import app, clear_response_caches
+from app.config import settings
 from app.database import Base, get_db
-from app import models
+from app import crud, models
 
-# Create a test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_bank_branches.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Tests assert exact /api/stats counts before and after inserting sample
+# data, so the TTL cache must not serve stale totals across requests
+settings.stats_cache_ttl = 0
+# The response cache ships disabled (no TTL, no production invalidation
+# hook); the suite is where repeated identical GETs actually occur, so
+# enable it here — _bind_session clears it after every test
+settings.response_cache_size = 512
 
+# Create a test database. In-memory SQLite keeps the whole suite off the
+# filesystem (no journaling or fsync in the fixture path); StaticPool
+# reuses the single connection that owns the in-memory database so every
+# session sees the same schema and data.
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
+)
+# expire_on_commit=False keeps fixture objects readable after commit
+# without a reload SELECT per attribute access
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test."""
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """Tune each test connection as it is created.
+
+    Durability is pure overhead for a database that is rebuilt from
+    scratch on each run, so syncing and journaling are turned off
+    entirely and temp structures stay in RAM. Disabling pysqlite's
+    implicit transaction handling (isolation_level=None, with BEGIN
+    emitted by the listener below) is required for SAVEPOINTs to scope
+    correctly, which the per-test rollback isolation relies on.
+    """
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    """Start transactions explicitly since pysqlite's implicit BEGIN is off."""
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def _create_tables():
+    """Create the schema once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(_create_tables):
+    """Provide a transactionally isolated session for each test.
+
+    Instead of rebuilding the schema per test, each test runs inside an
+    outer transaction on a dedicated connection; fixture commits land in
+    SAVEPOINTs (join_transaction_mode="create_savepoint") and the outer
+    rollback discards everything, leaving the shared schema pristine.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with test database."""
+# The get_db override reads the current test's session through this
+# holder, so the TestClient (and the app startup it triggers) is built
+# once per session instead of once per test
+_active_session = {"db": None}
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Create a session-scoped test client wired to the test database."""
     def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
-    
+        db = _active_session["db"]
+        if db is None:
+            # Requests made outside a test body (e.g. from class-scoped
+            # reference fixtures) get a plain read-only session
+            db = TestingSessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+        else:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
-@pytest.fixture(scope="function")
-def sample_banks(db_session):
-    """Create sample banks for testing."""
-    banks = [
-        models.Bank(id=1, name="STATE BANK OF INDIA"),
-        models.Bank(id=2, name="HDFC BANK"),
-        models.Bank(id=3, name="ICICI BANK")
-    ]
-    for bank in banks:
-        db_session.add(bank)
-    db_session.commit()
-    return banks
+@pytest_asyncio.fixture
+async def aclient(client):
+    """Async client sharing the sync client's database wiring.
 
+    Talks to the app in-process without the per-call thread spin-up of
+    the sync TestClient, so independent GETs can be fired concurrently
+    with asyncio.gather. Depends on `client` so the get_db override is
+    installed and app startup has already run.
+    """
+    async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+        yield ac
 
-@pytest.fixture(scope="function")
-def sample_branches(db_session, sample_banks):
-    """Create sample branches for testing."""
-    branches = [
-        models.Branch(
-            ifsc="SBIN0000001",
-            bank_id=1,
-            branch="MUMBAI MAIN",
-            address="MUMBAI SAMACHAR MARG, MUMBAI",
-            city="MUMBAI",
-            district="MUMBAI",
-            state="MAHARASHTRA"
-        ),
-        models.Branch(
-            ifsc="HDFC0000001",
-            bank_id=2,
-            branch="RTGS-HO",
-            address="KAMALA MILLS COMPOUND, MUMBAI",
-            city="MUMBAI",
-            district="MUMBAI",
-            state="MAHARASHTRA"
-        ),
-        models.Branch(
-            ifsc="ICIC0000001",
-            bank_id=3,
-            branch="MUMBAI NARIMAN POINT",
-            address="MITTAL TOWER, MUMBAI",
-            city="MUMBAI",
-            district="MUMBAI",
-            state="MAHARASHTRA"
-        ),
-        models.Branch(
-            ifsc="SBIN0000002",
-            bank_id=1,
-            branch="DELHI MAIN",
-            address="11 SANSAD MARG, NEW DELHI",
-            city="NEW DELHI",
-            district="NEW DELHI",
-            state="DELHI"
-        )
-    ]
-    for branch in branches:
-        db_session.add(branch)
-    db_session.commit()
-    return branches
+
+@pytest.fixture(autouse=True)
+def _bind_session(db_session):
+    """Point the shared client's get_db at this test's isolated session.
+
+    The app-level response cache is cleared on teardown: the app object is
+    shared across tests with different database states (e.g. empty_client),
+    so a response cached in one test must not leak into the next.
+    """
+    _active_session["db"] = db_session
+    yield
+    _active_session["db"] = None
+    clear_response_caches()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(client, _create_tables):
+    """Warm the app once per session (and per xdist worker).
+
+    The first request pays for Pydantic model compilation and route
+    setup, and /openapi.json forces the lazy schema build; doing it here
+    keeps that cost out of whichever test happens to run first. The
+    response cache is cleared afterwards so the warmed (empty) responses
+    never leak into a test.
+    """
+    client.get("/health")
+    client.get("/openapi.json")
+    for url in ("/api/banks", "/api/branches", "/api/stats"):
+        client.get(url)
+    clear_response_caches()
+
+
+# Insert statements and row data built once at import: the fixtures run
+# for nearly every test, so re-constructing the statement objects (and
+# re-planning their compilation) per test is wasted repeated work
+_BANK_INSERT = insert(models.Bank.__table__)
+_BRANCH_INSERT = insert(models.Branch.__table__)
+
+_SAMPLE_BANK_ROWS = [
+    {"id": 1, "name": "STATE BANK OF INDIA"},
+    {"id": 2, "name": "HDFC BANK"},
+    {"id": 3, "name": "ICICI BANK"},
+]
+
+_SAMPLE_BRANCH_ROWS = [
+    {
+        "ifsc": "SBIN0000001",
+        "bank_id": 1,
+        "branch": "MUMBAI MAIN",
+        "address": "MUMBAI SAMACHAR MARG, MUMBAI",
+        "city": "MUMBAI",
+        "district": "MUMBAI",
+        "state": "MAHARASHTRA"
+    },
+    {
+        "ifsc": "HDFC0000001",
+        "bank_id": 2,
+        "branch": "RTGS-HO",
+        "address": "KAMALA MILLS COMPOUND, MUMBAI",
+        "city": "MUMBAI",
+        "district": "MUMBAI",
+        "state": "MAHARASHTRA"
+    },
+    {
+        "ifsc": "ICIC0000001",
+        "bank_id": 3,
+        "branch": "MUMBAI NARIMAN POINT",
+        "address": "MITTAL TOWER, MUMBAI",
+        "city": "MUMBAI",
+        "district": "MUMBAI",
+        "state": "MAHARASHTRA"
+    },
+    {
+        "ifsc": "SBIN0000002",
+        "bank_id": 1,
+        "branch": "DELHI MAIN",
+        "address": "11 SANSAD MARG, NEW DELHI",
+        "city": "NEW DELHI",
+        "district": "NEW DELHI",
+        "state": "DELHI"
+    }
+]
+
+
+@pytest.fixture(scope="session")
+def sample_banks(_create_tables):
+    """Insert the sample banks once for the whole session.
+
+    Session scope shares the committed snapshot across every test class
+    that reads it (banks, branches, statistics, case-insensitivity), so
+    the INSERT cost is paid once per xdist worker rather than per test or
+    per class. The autouse per-test savepoint rollback in _bind_session
+    keeps intra-class isolation intact even if a write test is added.
+    """
+    with engine.begin() as conn:
+        conn.execute(_BANK_INSERT, _SAMPLE_BANK_ROWS)
+    return _SAMPLE_BANK_ROWS
+
+
+@pytest.fixture(scope="session")
+def sample_branches(sample_banks):
+    """Insert the sample branches once for the whole session."""
+    with engine.begin() as conn:
+        conn.execute(_BRANCH_INSERT, _SAMPLE_BRANCH_ROWS)
+    return _SAMPLE_BRANCH_ROWS
+
+
+@pytest.fixture
+def empty_db(monkeypatch):
+    """Stub the crud layer to behave like an empty database.
+
+    The empty-state tests only assert that no rows come back, so stubbed
+    crud functions replace the second engine-plus-schema those tests used
+    to build; the shared client is used as-is and the stubs expire with
+    the monkeypatch.
+    """
+    monkeypatch.setattr(crud, "get_banks", lambda db, **kwargs: [])
+    monkeypatch.setattr(crud, "get_branches", lambda db, **kwargs: [])
+    monkeypatch.setattr(crud, "get_banks_count", lambda db: 0)
+    monkeypatch.setattr(crud, "get_branches_count", lambda db, **kwargs: 0)
@@ -1,7 +1,20 @@
 """Comprehensive test cases for the Bank Branches API."""
+import asyncio
+
 import pytest
 
 
+def jget(client, url):
+    """GET a URL and return (status_code, parsed body).
+
+    Parsing the JSON exactly once per request keeps the CPU-bound decode
+    off the assert path; callers asserting on 4xx responses still get the
+    status code alongside the body.
+    """
+    response = client.get(url)
+    return response.status_code, response.json()
+
+
 class TestRootEndpoints:
     """Test root and health endpoints."""
     
@@ -28,7 +41,7 @@ class TestRootEndpoints:
 class TestBanksEndpoints:
     """Test bank-related endpoints."""
     
-    def test_list_banks_empty(self, client):
+    def test_list_banks_empty(self, client, empty_db):
         """Test listing banks when database is empty."""
         response = client.get("/api/banks")
         assert response.status_code == 200
@@ -42,34 +55,36 @@ class TestBanksEndpoints:
         assert len(data) == 3
         assert data[0]["name"] == "STATE BANK OF INDIA"
     
-    def test_list_banks_with_pagination(self, client, sample_banks):
-        """Test bank listing with pagination."""
-        response = client.get("/api/banks?page=1&page_size=2")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-    
-    def test_list_banks_with_search(self, client, sample_banks):
-        """Test bank listing with search filter."""
-        response = client.get("/api/banks?search=HDFC")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert data[0]["name"] == "HDFC BANK"
-    
-    def test_get_bank_by_id(self, client, sample_banks):
+    @pytest.mark.asyncio
+    async def test_get_bank_by_id(self, aclient, sample_banks):
         """Test retrieving a specific bank by ID."""
-        response = client.get("/api/banks/1")
+        response = await aclient.get("/api/banks/1")
         assert response.status_code == 200
         data = response.json()
         assert data["id"] == 1
         assert data["name"] == "STATE BANK OF INDIA"
-    
-    def test_get_bank_not_found(self, client, sample_banks):
+
+    @pytest.mark.asyncio
+    async def test_get_bank_not_found(self, aclient, sample_banks):
         """Test retrieving a non-existent bank."""
-        response = client.get("/api/banks/999")
+        response = await aclient.get("/api/banks/999")
         assert response.status_code == 404
         assert response.json()["detail"] == "Bank not found"
+
+    @pytest.mark.asyncio
+    async def test_get_banks_concurrently(self, aclient, sample_banks):
+        """Test that independent bank lookups can be served concurrently.
+
+        The three GETs are independent, so they are fired together with
+        asyncio.gather instead of one blocking round-trip each.
+        """
+        responses = await asyncio.gather(
+            *(aclient.get(f"/api/banks/{bank_id}") for bank_id in (1, 2, 3))
+        )
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert [r.json()["name"] for r in responses] == [
+            "STATE BANK OF INDIA", "HDFC BANK", "ICICI BANK"
+        ]
     
     def test_get_bank_branches(self, client, sample_banks, sample_branches):
         """Test retrieving branches of a specific bank."""
@@ -77,7 +92,9 @@ class TestBanksEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 2  # SBI has 2 branches in sample data
-        assert all(branch["bank_id"] == 1 for branch in data)
+        # Set comparison over a generator all(): built in C, and a failure
+        # shows the offending unique values instead of just "False"
+        assert {branch["bank_id"] for branch in data} == {1}
     
     def test_get_bank_branches_with_city_filter(self, client, sample_banks, sample_branches):
         """Test retrieving bank branches filtered by city."""
@@ -100,10 +117,46 @@ class TestBanksEndpoints:
         assert response.status_code == 404
 
 
+# The pagination/filter/search listing tests are all the same shape (GET a
+# URL, assert 200 and a result count), so they live in one table; the
+# optional validator carries each case's extra semantic assert. One
+# parametrized test amortizes fixture setup across all the cases.
+FILTER_CASES = [
+    ("/api/banks?page=1&page_size=2", 2, None),
+    ("/api/banks?search=HDFC", 1,
+     lambda data: data[0]["name"] == "HDFC BANK"),
+    ("/api/branches?page=1&page_size=2", 2, None),
+    ("/api/branches?bank_name=STATE BANK OF INDIA", 2,
+     lambda data: {branch["bank"]["name"] for branch in data} == {"STATE BANK OF INDIA"}),
+    ("/api/branches?city=MUMBAI", 3,
+     lambda data: {branch["city"] for branch in data} == {"MUMBAI"}),
+    ("/api/branches?state=DELHI", 1,
+     lambda data: data[0]["state"] == "DELHI"),
+    ("/api/branches?bank_name=STATE BANK OF INDIA&city=MUMBAI", 1,
+     lambda data: data[0]["bank"]["name"] == "STATE BANK OF INDIA" and data[0]["city"] == "MUMBAI"),
+    ("/api/branches?search=NARIMAN", 1,
+     lambda data: "NARIMAN POINT" in data[0]["branch"]),
+]
+
+
+class TestListFilters:
+    """Test pagination, filter and search parameters on the list endpoints."""
+
+    @pytest.mark.parametrize("url,expected_len,validator", FILTER_CASES)
+    def test_filter(self, client, sample_banks, sample_branches, url, expected_len, validator):
+        """Test that a filtered listing returns the expected rows."""
+        response = client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == expected_len
+        if validator is not None:
+            assert validator(data)
+
+
 class TestBranchesEndpoints:
     """Test branch-related endpoints."""
     
-    def test_list_branches_empty(self, client, sample_banks):
+    def test_list_branches_empty(self, client, empty_db):
         """Test listing branches when none exist."""
         response = client.get("/api/branches")
         assert response.status_code == 200
@@ -117,54 +170,6 @@ class TestBranchesEndpoints:
         assert len(data) == 4
         assert "bank" in data[0]
     
-    def test_list_branches_with_pagination(self, client, sample_banks, sample_branches):
-        """Test branch listing with pagination."""
-        response = client.get("/api/branches?page=1&page_size=2")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-    
-    def test_list_branches_filter_by_bank(self, client, sample_banks, sample_branches):
-        """Test filtering branches by bank name."""
-        response = client.get("/api/branches?bank_name=STATE BANK OF INDIA")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-        assert all(branch["bank"]["name"] == "STATE BANK OF INDIA" for branch in data)
-    
-    def test_list_branches_filter_by_city(self, client, sample_banks, sample_branches):
-        """Test filtering branches by city."""
-        response = client.get("/api/branches?city=MUMBAI")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 3
-        assert all(branch["city"] == "MUMBAI" for branch in data)
-    
-    def test_list_branches_filter_by_state(self, client, sample_banks, sample_branches):
-        """Test filtering branches by state."""
-        response = client.get("/api/branches?state=DELHI")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert data[0]["state"] == "DELHI"
-    
-    def test_list_branches_multiple_filters(self, client, sample_banks, sample_branches):
-        """Test filtering branches with multiple parameters."""
-        response = client.get("/api/branches?bank_name=STATE BANK OF INDIA&city=MUMBAI")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert data[0]["bank"]["name"] == "STATE BANK OF INDIA"
-        assert data[0]["city"] == "MUMBAI"
-    
-    def test_list_branches_with_search(self, client, sample_banks, sample_branches):
-        """Test searching branches by name or address."""
-        response = client.get("/api/branches?search=NARIMAN")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 1
-        assert "NARIMAN POINT" in data[0]["branch"]
-    
     def test_get_branch_by_ifsc(self, client, sample_banks, sample_branches):
         """Test retrieving a branch by IFSC code."""
         response = client.get("/api/branches/SBIN0000001")
@@ -184,21 +189,21 @@ class TestBranchesEndpoints:
     
     def test_get_branch_not_found(self, client, sample_banks, sample_branches):
         """Test retrieving non-existent branch."""
-        response = client.get("/api/branches/XXXX0000000")
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Branch not found"
-    
+        status, body = jget(client, "/api/branches/XXXX0000000")
+        assert status == 404
+        assert body["detail"] == "Branch not found"
+
     def test_get_branch_invalid_ifsc_length(self, client, sample_banks, sample_branches):
         """Test IFSC code validation."""
-        response = client.get("/api/branches/SHORT")
-        assert response.status_code == 400
-        assert "11 characters" in response.json()["detail"]
+        status, body = jget(client, "/api/branches/SHORT")
+        assert status == 400
+        assert "11 characters" in body["detail"]
 
 
 class TestStatisticsEndpoint:
     """Test statistics endpoint."""
     
-    def test_get_statistics_empty(self, client):
+    def test_get_statistics_empty(self, client, empty_db):
         """Test statistics with empty database."""
         response = client.get("/api/stats")
         assert response.status_code == 200
@@ -216,40 +221,48 @@ class TestStatisticsEndpoint:
 
 
 class TestCaseInsensitivity:
-    """Test case-insensitive search functionality."""
+    """Test case-insensitive search functionality.
+
+    Each variant is a parametrized case compared against one class-scoped
+    reference response, instead of three sequential requests per test.
+    """
+
+    @pytest.fixture(scope="class")
+    def reference_bank_search(self, client, sample_banks):
+        """Canonical bank-search response every case variant must match."""
+        return client.get("/api/banks?search=HDFC").json()
+
+    @pytest.fixture(scope="class")
+    def reference_city_filter(self, client, sample_branches):
+        """Canonical city-filter response every case variant must match."""
+        return client.get("/api/branches?city=MUMBAI").json()
     
-    def test_bank_search_case_insensitive(self, client, sample_banks):
+    @pytest.mark.parametrize("q", ["hdfc", "HDFC", "Hdfc"])
+    def test_bank_search_case_insensitive(self, client, sample_banks, reference_bank_search, q):
         """Test bank search is case-insensitive."""
-        response1 = client.get("/api/banks?search=hdfc")
-        response2 = client.get("/api/banks?search=HDFC")
-        response3 = client.get("/api/banks?search=Hdfc")
-        
-        assert response1.json() == response2.json() == response3.json()
-    
-    def test_city_filter_case_insensitive(self, client, sample_banks, sample_branches):
+        status, data = jget(client, f"/api/banks?search={q}")
+        assert status == 200
+        assert data == reference_bank_search
+
+    @pytest.mark.parametrize("city", ["mumbai", "MUMBAI", "Mumbai"])
+    def test_city_filter_case_insensitive(self, client, sample_branches, reference_city_filter, city):
         """Test city filter is case-insensitive."""
-        response1 = client.get("/api/branches?city=mumbai")
-        response2 = client.get("/api/branches?city=MUMBAI")
-        response3 = client.get("/api/branches?city=Mumbai")
-        
-        assert len(response1.json()) == len(response2.json()) == len(response3.json())
+        status, data = jget(client, f"/api/branches?city={city}")
+        assert status == 200
+        assert data == reference_city_filter
 
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
-    
-    def test_invalid_page_number(self, client, sample_banks):
-        """Test invalid page number."""
-        response = client.get("/api/banks?page=0")
-        assert response.status_code == 422  # Validation error
-    
-    def test_invalid_page_size(self, client, sample_banks):
-        """Test invalid page size."""
-        response = client.get("/api/banks?page_size=101")
-        assert response.status_code == 422  # Validation error
-    
-    def test_large_page_number(self, client, sample_banks):
-        """Test large page number returns empty list."""
-        response = client.get("/api/banks?page=1000")
-        assert response.status_code == 200
-        assert response.json() == []
+
+    @pytest.mark.parametrize("url,expected_status,expected_body", [
+        ("/api/banks?page=0", 422, None),        # page below minimum
+        ("/api/banks?page_size=101", 422, None),  # page_size above maximum
+        ("/api/banks?page=1000", 200, []),        # past the last page
+    ])
+    def test_pagination_edge_cases(self, client, sample_banks, url, expected_status, expected_body):
+        """Test pagination bounds validation and out-of-range pages."""
+        status, body = jget(client, url)
+        assert status == expected_status
+        if expected_body is not None:
+            assert body == expected_body